@@ -11,6 +11,7 @@ Usage:
 """
 
 import argparse
+import selectors
 import socket
 import threading
 import time
@@ -26,6 +27,13 @@ FLAG_EXCLUSIVE = 4
 FLAG_BLOCKING = 8
 FLAG_MULTI = 16
 
+TX_FLUSH_BYTES = 1460  # One TCP MSS; flush the outbound buffer at this size
+
+EMPTY_PAYLOAD = b"\x00" * 70  # SERIAL_CONTROL data field for poll requests
+
+# Serializes MAVLink sends across threads; each send reads and bumps mav.mav.seq
+_send_lock = threading.Lock()
+
 
 def format_ascii(data):
     printable = set(string.printable)
@@ -50,14 +58,16 @@ class TcpBridge:
         self.client = None
         self.client_lock = threading.Lock()
         self.running = False
+        self._tx_buf = bytearray()
 
     def start(self):
+        """Bind and listen; accepting is driven by a BridgeHub."""
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server.bind((self.host, self.port))
         self.server.listen(1)
+        self.server.setblocking(False)
         self.running = True
-        threading.Thread(target=self._accept_loop, daemon=True).start()
 
     def stop(self):
         self.running = False
@@ -68,17 +78,18 @@ class TcpBridge:
             pass
         self.close_client()
 
-    def _accept_loop(self):
-        while self.running:
-            try:
-                client, addr = self.server.accept()
-                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                with self.client_lock:
-                    self.close_client()
-                    self.client = client
-                print(f"✅ [{self.name}] Client connected from {addr[0]}:{addr[1]}")
-            except Exception:
-                time.sleep(0.2)
+    def accept(self):
+        """Accept a pending client, replacing any existing one."""
+        try:
+            client, addr = self.server.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        client.setblocking(True)
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.client_lock:
+            self.close_client()
+            self.client = client
+        print(f"✅ [{self.name}] Client connected from {addr[0]}:{addr[1]}")
 
     def close_client(self):
         if self.client:
@@ -93,14 +104,28 @@ class TcpBridge:
             return self.client
 
     def send(self, data):
-        """Send data to connected client."""
+        """Queue data for the connected client; flushed in MSS-sized batches."""
+        if self.get_client() is None:
+            self._tx_buf.clear()
+            return False
+        self._tx_buf.extend(data)
+        if len(self._tx_buf) >= TX_FLUSH_BYTES:
+            return self.flush()
+        return True
+
+    def flush(self):
+        """Send all queued data to the connected client in one sendall."""
+        if not self._tx_buf:
+            return True
         client = self.get_client()
         if client:
             try:
-                client.sendall(data)
+                client.sendall(self._tx_buf)
+                self._tx_buf.clear()
                 return True
             except Exception:
                 self.close_client()
+        self._tx_buf.clear()
         return False
 
     def recv(self, size=4096):
@@ -114,6 +139,47 @@ class TcpBridge:
         return None
 
 
+class BridgeHub:
+    """Single accept thread serving several TcpBridge listen sockets."""
+
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.bridges = []
+        self.running = False
+
+    def add(self, bridge):
+        """Start a bridge and register its listen socket."""
+        bridge.start()
+        self.selector.register(bridge.server, selectors.EVENT_READ, bridge)
+        self.bridges.append(bridge)
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        for bridge in self.bridges:
+            try:
+                self.selector.unregister(bridge.server)
+            except Exception:
+                pass
+            bridge.stop()
+        try:
+            self.selector.close()
+        except Exception:
+            pass
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                events = self.selector.select(timeout=1.0)
+                for key, _mask in events:
+                    key.data.accept()
+            except Exception:
+                time.sleep(0.2)
+
+
 def send_serial_bytes(mav, device, data, baud, exclusive):
     """Send data to GPS2 via MAVLink SERIAL_CONTROL."""
     offset = 0
@@ -123,54 +189,94 @@ def send_serial_bytes(mav, device, data, baud, exclusive):
         count = len(chunk)
         if count < 70:
             chunk = chunk + b"\x00" * (70 - count)
-        mav.mav.serial_control_send(
-            device,
-            flags,
-            0,
-            baud,
-            count,
-            chunk,
-        )
+        with _send_lock:
+            mav.mav.serial_control_send(
+                device,
+                flags,
+                0,
+                baud,
+                count,
+                chunk,
+            )
         offset += count
         time.sleep(0.01)
 
 
+def build_poll_frames(mav, device, flags, baud):
+    """Pre-encode the GPS2 poll request once per MAVLink sequence number.
+
+    Returns a list of 256 wire frames indexed by sequence number, or None if
+    outgoing packets are signed (the signature cannot be templated).
+    """
+    signing = getattr(mav.mav, "signing", None)
+    if signing is not None and getattr(signing, "sign_outgoing", False):
+        return None
+    msg = mav.mav.serial_control_encode(device, flags, 10, baud, 0, EMPTY_PAYLOAD)
+    template = bytearray(msg.pack(mav.mav))
+    seq_index = 2 if template[0] == 0xFE else 4  # MAVLink1 vs MAVLink2 header
+    crc_extra = bytes([msg.crc_extra])
+    frames = []
+    for seq in range(256):
+        template[seq_index] = seq
+        crc = mavutil.mavlink.x25crc(bytes(template[1:-2]))
+        crc.accumulate(crc_extra)
+        template[-2:] = crc.crc.to_bytes(2, "little")
+        frames.append(bytes(template))
+    return frames
+
+
 def gps2_to_tcp_loop(mav, device, gps_baud, bridge, request_interval_ms, exclusive, show_gps2, show_hex):
     """Read GPS2 data and forward to TCP bridge."""
     next_request = 0
     last_empty_print = 0
+    flags = FLAG_RESPOND | FLAG_MULTI
+    if exclusive:
+        flags |= FLAG_EXCLUSIVE
+    poll_frames = build_poll_frames(mav, device, flags, gps_baud)
     
     while True:
         now = time.time()
         if now >= next_request:
-            flags = FLAG_RESPOND | FLAG_MULTI
-            if exclusive:
-                flags |= FLAG_EXCLUSIVE
-            mav.mav.serial_control_send(
-                device,
-                flags,
-                10,
-                gps_baud,
-                0,
-                b"\x00" * 70,
-            )
+            with _send_lock:
+                if poll_frames:
+                    # Same bookkeeping as MAVLink.send(), with a pre-encoded frame
+                    seq = mav.mav.seq
+                    frame = poll_frames[seq]
+                    mav.write(frame)
+                    mav.mav.seq = (seq + 1) % 256
+                    mav.mav.total_packets_sent += 1
+                    mav.mav.total_bytes_sent += len(frame)
+                else:
+                    mav.mav.serial_control_send(
+                        device,
+                        flags,
+                        10,
+                        gps_baud,
+                        0,
+                        EMPTY_PAYLOAD,
+                    )
             next_request = now + (request_interval_ms / 1000.0)
 
-        msg = mav.recv_match(type="SERIAL_CONTROL", blocking=False)
-        if msg is not None and getattr(msg, "count", 0) > 0 and msg.device == device:
-            data = bytes(msg.data[: msg.count])
-            if not is_all_zero(data):
-                if show_gps2:
-                    print(f"[GPS2 -> TCP] ({len(data)} bytes) {format_ascii(data)}")
-                if show_hex:
-                    print(f"[GPS2 -> TCP][hex] {data.hex(' ')}")
-                
-                # Forward to TCP bridge
-                bridge.send(data)
-            elif now - last_empty_print >= 1.0:
-                if show_gps2:
-                    print("[GPS2 -> TCP] <no data>")
-                last_empty_print = now
+        # Drain every pending message, then push them to TCP in one write
+        while True:
+            msg = mav.recv_match(type="SERIAL_CONTROL", blocking=False)
+            if msg is None:
+                break
+            if getattr(msg, "count", 0) > 0 and msg.device == device:
+                data = bytes(msg.data[: msg.count])
+                if not is_all_zero(data):
+                    if show_gps2:
+                        print(f"[GPS2 -> TCP] ({len(data)} bytes) {format_ascii(data)}")
+                    if show_hex:
+                        print(f"[GPS2 -> TCP][hex] {data.hex(' ')}")
+                    
+                    # Forward to TCP bridge
+                    bridge.send(data)
+                elif now - last_empty_print >= 1.0:
+                    if show_gps2:
+                        print("[GPS2 -> TCP] <no data>")
+                    last_empty_print = now
+        bridge.flush()
         
         time.sleep(0.005)
 
@@ -284,9 +390,12 @@ def main():
     mav.wait_heartbeat()
     print(f"✅ Connected: sysid={mav.target_system} compid={mav.target_component}")
 
+    # One accept thread serves every TCP bridge
+    hub = BridgeHub()
+
     # Create TCP bridge for GPS2 data (always needed)
     gps_bridge = TcpBridge(args.tcp_host, args.gps_tcp_port, "GPS2→uPrecise")
-    gps_bridge.start()
+    hub.add(gps_bridge)
     
     print(f"🌐 TCP Bridge for GPS2 data listening on {args.tcp_host}:{args.gps_tcp_port}")
     print(f"   Configure uPrecise to connect as TCP client to receive GPS2 data")
@@ -315,7 +424,7 @@ def main():
     else:
         # TCP mode: Read RTCM from TCP bridge
         rtcm_bridge = TcpBridge(args.tcp_host, args.rtcm_tcp_port, "uPrecise→Rover")
-        rtcm_bridge.start()
+        hub.add(rtcm_bridge)
         
         print(f"🌐 TCP Bridge for RTCM data listening on {args.tcp_host}:{args.rtcm_tcp_port}")
         print(f"   Configure uPrecise to output RTCM to this TCP port")
@@ -327,14 +436,14 @@ def main():
             daemon=True
         ).start()
 
+    hub.start()
+
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("\n🛑 Stopping bridge...")
-        gps_bridge.stop()
-        if not args.rtcm_serial_port:
-            rtcm_bridge.stop()
+        hub.stop()
 
 
 if __name__ == "__main__":
@@ -6,18 +6,28 @@ to avoid COM port duplication issues.
 """
 
 import base64
+import bisect
+import io
 import json
 import os
+import queue
+import re
+import selectors
 import serial
 import serial.tools.list_ports
 import socket
 import sys
 import threading
 import time
-from collections import Counter
 from datetime import datetime
 from typing import Dict, Optional, Tuple
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # Log directory path
 LOG_DIR = r"C:\Users\oxpas\Documents\GitHub\DroneDevTools\RTKtools\RTKbaseTester\logs"
@@ -70,6 +80,132 @@ QUALITY_NAMES = {
     8: "Simulation",
 }
 
+_now = time.monotonic  # Module-level alias for the worker loops
+_INV_60 = 1.0 / 60.0  # Minutes -> degrees
+
+# NMEA field extractors (match raw bytes; only the fields we use are captured)
+_GGA_RE = re.compile(
+    rb"^\$G[NP]GGA,([^,]*),([^,]*),([^,]*),([^,]*),([^,]*),([^,]*),([^,]*),([^,]*),([^,]*),"
+    rb"[^,]*,([^,]*),[^,]*,[^,]*,"
+)
+_RMC_RE = re.compile(rb"^\$G[NP]RMC,(?:[^,]*,){6}([^,]*),([^,]*),[^,]*,[^,]*,")
+_GSA_RE = re.compile(rb"^\$G[NP]GSA,(?:[^,]*,){14}([^,]*),([^,*]*)(?:,([^,*]*))?")
+
+# Talker + sentence id (line[1:6]) -> sentence we parse
+_NMEA_SENTENCE = {
+    b"GNGGA": "GGA", b"GPGGA": "GGA",
+    b"GNRMC": "RMC", b"GPRMC": "RMC",
+    b"GNGSA": "GSA", b"GPGSA": "GSA",
+}
+
+# ANSI clear screen + cursor home
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+# Rewrite only the "Runtime:" line (row 4), keeping the cursor where it was
+RUNTIME_LINE = "\x1b7\x1b[4;1HRuntime: {:.1f}s\x1b[K\x1b8"
+
+# Full redraw at least this often even when no new data arrived (seconds)
+DISPLAY_FULL_REFRESH = 2.0
+
+# Longest NMEA line kept while waiting for a line ending (bytes)
+NMEA_MAX_LINE = 4096
+
+# NTRIP v2 GET request
+NTRIP_REQUEST_TEMPLATE = (
+    "GET /{mountpoint} HTTP/1.0\r\n"
+    "Host: {host}\r\n"
+    "User-Agent: RTK-Rover-Complete/1.0\r\n"
+    "Authorization: Basic {auth}\r\n"
+    "Ntrip-Version: Ntrip/2.0\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+)
+
+# NTRIP socket receive size (bytes), upper bound
+NTRIP_RECV_SIZE = 64 * 1024
+
+# Longest blocking rover write per event-loop pass (seconds); NTRIP reads are
+# capped to what the rover baud rate drains in this time
+ROVER_WRITE_BUDGET = 0.1
+
+# RTCM3 frame buffer size (bytes)
+RTCM_BUFFER_SIZE = 64 * 1024
+
+# RTCM3 CRC-24Q polynomial
+CRC24Q_POLY = 0x1864CFB
+
+# Typical RTK Float convergence time (seconds) by conditions tier:
+# 0 = limited, 1 = moderate (>=2 msg types, >=8 sats), 2 = good (>=4 msg types, >=12 sats)
+RTK_FLOAT_TIME_BY_TIER = (120.0, 90.0, 60.0)
+
+
+def _make_crc24q_table() -> tuple:
+    """Build the byte-wise CRC-24Q lookup table."""
+    table = []
+    for i in range(256):
+        crc = i << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= CRC24Q_POLY
+        table.append(crc & 0xFFFFFF)
+    return tuple(table)
+
+
+_CRC24Q_TABLE = _make_crc24q_table()
+
+
+def crc24q(data) -> int:
+    """Compute the RTCM3 CRC-24Q of a bytes-like object."""
+    crc = 0
+    table = _CRC24Q_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ table[(crc >> 16) ^ b]
+    return crc
+
+
+def scan_rtcm_frames(buf: bytearray, start: int, end: int, msg_types: list) -> int:
+    """
+    Parse complete RTCM3 frames in buf[start:end].
+    
+    Appends the message type of each complete frame whose CRC-24Q matches to
+    msg_types and returns the offset of the first byte that still needs more
+    data. On a CRC mismatch the scan resumes one byte after the false sync.
+    """
+    offset = start
+    while True:
+        # Look for sync byte 0xD3 (memchr-backed)
+        sync_index = buf.find(b"\xD3", offset, end)
+        if sync_index == -1:
+            # No sync byte left, drop the garbage
+            return end
+        
+        if end - sync_index < 3:
+            # Not enough data for header
+            return sync_index
+        
+        # Header after sync: 6 bits reserved + 10 bits length
+        length = ((buf[sync_index + 1] & 0x03) << 8) | buf[sync_index + 2]
+        
+        frame_len = 3 + length + 3  # sync+header + payload + CRC
+        if end - sync_index < frame_len:
+            # Wait for more data
+            return sync_index
+        
+        # Verify CRC-24Q over sync + header + payload
+        crc_index = sync_index + 3 + length
+        if crc24q(buf[sync_index:crc_index]) != int.from_bytes(buf[crc_index:crc_index + 3], "big"):
+            offset = sync_index + 1
+            continue
+        
+        # First 12 bits of the payload are the message number
+        if length >= 2:
+            msg_type = ((buf[sync_index + 3] << 4) | (buf[sync_index + 4] >> 4)) & 0x0FFF
+            if msg_type > 0:
+                msg_types.append(msg_type)
+        
+        offset = sync_index + frame_len
+
 
 class RTKRoverComplete:
     """Main class combining NTRIP forwarding and rover monitoring."""
@@ -77,9 +213,16 @@ class RTKRoverComplete:
     def __init__(self, config: dict):
         self.config = config
         self.running = False
+        self._display_interval = config.get("display_interval", 0.5)
         
         # NTRIP connection
         self.ntrip_sock: Optional[socket.socket] = None
+        # ~10 bits per byte on the serial line
+        recv_size = int(config.get("rover_baudrate", 115200) / 10 * ROVER_WRITE_BUDGET)
+        self._ntrip_buf = bytearray(min(NTRIP_RECV_SIZE, max(256, recv_size)))  # Reused receive buffer
+        self._ntrip_view = memoryview(self._ntrip_buf)
+        self._ntrip_request_key: Optional[Tuple[str, str, str, str]] = None
+        self._ntrip_request = b""  # Encoded request for _ntrip_request_key
         
         # Rover serial connection
         self.rover_ser: Optional[serial.Serial] = None
@@ -92,8 +235,10 @@ class RTKRoverComplete:
         # RTCM validation
         self.rtcm_valid_frames = 0  # Count of valid RTCM3 frames detected
         self.rtcm_last_received_time: Optional[float] = None
-        self.rtcm_buffer = bytearray()
-        self.rtcm_msg_types = set()  # Track RTCM message types received
+        self.rtcm_buffer = bytearray(RTCM_BUFFER_SIZE)  # Preallocated receive buffer
+        self._rtcm_end = 0  # Write cursor into rtcm_buffer
+        self._rtcm_types_seen = bytearray(4096)  # Seen flag per 12-bit RTCM message type
+        self.rtcm_msg_types = []  # Sorted RTCM message types received
         self.rtcm_first_frame_time: Optional[float] = None  # Time when first RTCM frame received
         self.rtcm_data_gap_threshold = 10.0  # Seconds without RTCM data to consider gap
         self.rtcm_gaps = []  # Track RTCM data gaps
@@ -101,14 +246,15 @@ class RTKRoverComplete:
         
         # Rover data
         self.rover_data: Dict = {}
-        self.data_history = []
+        self._rover_buf = bytearray()  # Serial bytes not yet split into lines
         self.best_quality = QUALITY_NO_FIX
         self.rtk_float_time: Optional[float] = None
         self.rtk_fixed_time: Optional[float] = None
         
         # RTK status tracking
         self.initial_quality: Optional[int] = None
-        self.quality_changes = []  # Track quality changes over time
+        self.quality_changes = []  # Track quality changes over time (main thread only)
+        self._quality_change_q = queue.SimpleQueue()  # Reader thread -> quality_changes
         self.last_quality_update_time: Optional[float] = None
         
         # RTCM adoption confirmation signals
@@ -118,8 +264,11 @@ class RTKRoverComplete:
         self.vendor_messages_received = []  # Track vendor-specific messages
         
         # Threading
-        self.start_time = time.time()
+        self.start_time = _now()
         self.lock = threading.Lock()
+        self._dirty = True  # Set by worker threads when shared state changes
+        self._last_redraw = float("-inf")  # Elapsed time of the last full redraw
+        self._rover_thread: Optional[threading.Thread] = None  # Only when the port has no fd
     
     def load_config(self, config_path: str = CONFIG_FILE) -> dict:
         """Load configuration from JSON file."""
@@ -129,8 +278,8 @@ class RTKRoverComplete:
             return DEFAULT_CONFIG.copy()
         
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
+            with open(config_path, "rb") as f:
+                config = _json_loads(f.read())
             
             merged_config = DEFAULT_CONFIG.copy()
             merged_config.update(config)
@@ -146,10 +295,11 @@ class RTKRoverComplete:
         """Try to find the rover device port automatically."""
         print("🔍 Searching for rover device...")
         ports = serial.tools.list_ports.comports()
+        wanted = device_name.upper()
         
         for port in ports:
             print(f"   Found: {port.device} - {port.description}")
-            if device_name.upper() in port.description.upper():
+            if wanted in port.description.upper():
                 print(f"✅ Found rover device: {port.device}")
                 return port.device
         
@@ -160,19 +310,15 @@ class RTKRoverComplete:
         return None
     
     def build_ntrip_request(self, host: str, mountpoint: str, user: str, password: str) -> bytes:
-        """Build a minimal NTRIP v2 GET request."""
-        auth = base64.b64encode(f"{user}:{password}".encode("ascii")).decode("ascii")
-        lines = [
-            f"GET /{mountpoint} HTTP/1.0",
-            f"Host: {host}",
-            "User-Agent: RTK-Rover-Complete/1.0",
-            f"Authorization: Basic {auth}",
-            "Ntrip-Version: Ntrip/2.0",
-            "Connection: close",
-            "",
-            "",
-        ]
-        return "\r\n".join(lines).encode("ascii")
+        """Build a minimal NTRIP v2 GET request (cached until the parameters change)."""
+        key = (host, mountpoint, user, password)
+        if key != self._ntrip_request_key:
+            auth = base64.b64encode(f"{user}:{password}".encode("ascii")).decode("ascii")
+            self._ntrip_request = NTRIP_REQUEST_TEMPLATE.format(
+                mountpoint=mountpoint, host=host, auth=auth
+            ).encode("ascii")
+            self._ntrip_request_key = key
+        return self._ntrip_request
     
     def connect_ntrip(self) -> Tuple[socket.socket, bytes]:
         """Connect to NTRIP caster."""
@@ -197,7 +343,7 @@ class RTKRoverComplete:
         sock.sendall(request)
         
         # Read response header
-        header = b""
+        header = bytearray()
         max_header = 64 * 1024
         
         while len(header) < max_header:
@@ -215,9 +361,11 @@ class RTKRoverComplete:
             if not chunk:
                 break
             
-            header += chunk
+            # Only the new bytes (plus a 3-byte overlap) can complete the terminator
+            search_from = max(len(header) - 3, 0)
+            header.extend(chunk)
             
-            if b"\r\n\r\n" in header:
+            if header.find(b"\r\n\r\n", search_from) != -1:
                 break
             
             try:
@@ -250,7 +398,7 @@ class RTKRoverComplete:
                 else:
                     header_end = len(header)
             
-            binary_data = header[header_end:] if header_end < len(header) else b""
+            binary_data = bytes(header[header_end:]) if header_end < len(header) else b""
             return sock, binary_data
         else:
             sock.close()
@@ -285,47 +433,43 @@ class RTKRoverComplete:
             print(f"❌ Unexpected error: {e}")
             raise
     
-    def parse_nmea_gga(self, line: str) -> Optional[Dict]:
+    def parse_nmea_gga(self, line: bytes) -> Optional[Dict]:
         """Parse NMEA GNGGA or GPGGA sentence."""
-        if not (line.startswith("$GNGGA") or line.startswith("$GPGGA")):
+        m = _GGA_RE.match(line)
+        if m is None:
             return None
         
         try:
-            parts = line.split(",")
-            if len(parts) < 15:
-                return None
-            
-            time_str = parts[1] if parts[1] else None
-            lat_str = parts[2] if parts[2] else None
-            lat_dir = parts[3] if parts[3] else None
-            lon_str = parts[4] if parts[4] else None
-            lon_dir = parts[5] if parts[5] else None
-            quality = int(parts[6]) if parts[6] else QUALITY_NO_FIX
-            num_sats = int(parts[7]) if parts[7] else 0
-            hdop = float(parts[8]) if parts[8] else 0.0
-            altitude = float(parts[9]) if parts[9] else 0.0
-            geoid_sep = float(parts[11]) if len(parts) > 11 and parts[11] else 0.0
+            (time_str, lat_str, lat_dir, lon_str, lon_dir,
+             quality_str, sats_str, hdop_str, alt_str, geoid_str) = m.groups()
+            quality = int(quality_str) if quality_str else QUALITY_NO_FIX
+            num_sats = int(sats_str) if sats_str else 0
+            hdop = float(hdop_str) if hdop_str else 0.0
+            altitude = float(alt_str) if alt_str else 0.0
+            geoid_sep = float(geoid_str) if geoid_str else 0.0
             
             latitude = None
             if lat_str and lat_dir:
                 try:
-                    lat_deg = float(lat_str[:2])
-                    lat_min = float(lat_str[2:])
-                    latitude = lat_deg + lat_min / 60.0
-                    if lat_dir == "S":
+                    # ddmm.mmmm -> degrees without slicing the string
+                    v = float(lat_str)
+                    deg = int(v * 0.01)
+                    latitude = deg + (v - deg * 100) * _INV_60
+                    if lat_dir == b"S":
                         latitude = -latitude
-                except (ValueError, IndexError):
+                except ValueError:
                     pass
             
             longitude = None
             if lon_str and lon_dir:
                 try:
-                    lon_deg = float(lon_str[:3])
-                    lon_min = float(lon_str[3:])
-                    longitude = lon_deg + lon_min / 60.0
-                    if lon_dir == "W":
+                    # dddmm.mmmm -> degrees without slicing the string
+                    v = float(lon_str)
+                    deg = int(v * 0.01)
+                    longitude = deg + (v - deg * 100) * _INV_60
+                    if lon_dir == b"W":
                         longitude = -longitude
-                except (ValueError, IndexError):
+                except ValueError:
                     pass
             
             utc_time = None
@@ -352,47 +496,43 @@ class RTKRoverComplete:
         except (ValueError, IndexError):
             return None
     
-    def parse_nmea_rmc(self, line: str) -> Optional[Dict]:
+    def parse_nmea_rmc(self, line: bytes) -> Optional[Dict]:
         """Parse NMEA GNRMC or GPRMC sentence."""
-        if not (line.startswith("$GNRMC") or line.startswith("$GPRMC")):
+        m = _RMC_RE.match(line)
+        if m is None:
             return None
         
         try:
-            parts = line.split(",")
-            if len(parts) < 12:
-                return None
-            
-            speed_knots = float(parts[7]) if parts[7] else 0.0
-            track = float(parts[8]) if parts[8] else 0.0
+            speed_str, track_str = m.groups()
+            speed_knots = float(speed_str) if speed_str else 0.0
+            track = float(track_str) if track_str else 0.0
             
             return {
                 "speed_knots": speed_knots,
                 "speed_ms": speed_knots * 0.514444,
                 "track": track,
             }
-        except (ValueError, IndexError):
+        except ValueError:
             return None
     
-    def parse_nmea_gsa(self, line: str) -> Optional[Dict]:
+    def parse_nmea_gsa(self, line: bytes) -> Optional[Dict]:
         """Parse NMEA GNGSA or GPGSA sentence."""
-        if not (line.startswith("$GNGSA") or line.startswith("$GPGSA")):
+        m = _GSA_RE.match(line)
+        if m is None:
             return None
         
         try:
-            parts = line.split(",")
-            if len(parts) < 17:
-                return None
-            
-            pdop = float(parts[15]) if parts[15] else 0.0
-            hdop = float(parts[16]) if parts[16] else 0.0
-            vdop = float(parts[17]) if len(parts) > 17 and parts[17] else 0.0
+            pdop_str, hdop_str, vdop_str = m.groups()
+            pdop = float(pdop_str) if pdop_str else 0.0
+            hdop = float(hdop_str) if hdop_str else 0.0
+            vdop = float(vdop_str) if vdop_str else 0.0
             
             return {
                 "pdop": pdop,
                 "hdop": hdop,
                 "vdop": vdop,
             }
-        except (ValueError, IndexError):
+        except ValueError:
             return None
     
     def parse_vendor_messages(self, line: str) -> Optional[Dict]:
@@ -430,10 +570,9 @@ class RTKRoverComplete:
         
         return None
     
-    def check_rtcm_adoption_signal(self, quality: int, vendor_msg: Optional[Dict] = None):
+    def check_rtcm_adoption_signal(self, quality: int, now: float, vendor_msg: Optional[Dict] = None):
         """Check for RTCM adoption confirmation signals."""
-        current_time = time.time()
-        elapsed = current_time - self.start_time
+        elapsed = now - self.start_time
         
         # Signal 1: Quality upgrade to DGPS (2), RTK Float (5), or RTK Fixed (4)
         if not self.rtcm_adoption_confirmed:
@@ -462,56 +601,35 @@ class RTKRoverComplete:
                 if vendor_msg not in self.vendor_messages_received:
                     self.vendor_messages_received.append(vendor_msg)
     
-    def validate_rtcm_data(self, data: bytes):
-        """Validate RTCM3 data and count valid frames."""
-        self.rtcm_buffer.extend(data)
-        current_time = time.time()
-        
-        # Parse RTCM3 frames
-        while True:
-            # Look for sync byte 0xD3
-            try:
-                sync_index = self.rtcm_buffer.index(0xD3)
-            except ValueError:
-                # No sync byte found
-                if len(self.rtcm_buffer) > 1024:
-                    self.rtcm_buffer.clear()
-                break
-            
-            if len(self.rtcm_buffer) - sync_index < 3:
-                # Not enough data for header
-                if sync_index > 0:
-                    del self.rtcm_buffer[:sync_index]
-                break
-            
-            # Parse RTCM3 header
-            header = self.rtcm_buffer[sync_index + 1 : sync_index + 3]
-            length = ((header[0] & 0x03) << 8) | header[1]
-            
-            frame_len = 3 + length + 3  # sync+header + payload + CRC
-            if len(self.rtcm_buffer) - sync_index < frame_len:
-                # Wait for more data
-                if sync_index > 0:
-                    del self.rtcm_buffer[:sync_index]
-                break
-            
-            # Extract frame
-            frame = self.rtcm_buffer[sync_index : sync_index + frame_len]
-            del self.rtcm_buffer[: sync_index + frame_len]
-            
-            # Validate frame (basic checks)
-            if len(frame) >= 6:
-                # Extract message type from payload
-                payload = frame[3:-3]
-                if len(payload) >= 2:
-                    msg_type = ((payload[0] << 4) | (payload[1] >> 4)) & 0x0FFF
-                    if msg_type > 0:
-                        with self.lock:
-                            self.rtcm_valid_frames += 1
-                            self.rtcm_msg_types.add(msg_type)
-                            self.rtcm_last_received_time = current_time
-                            if self.rtcm_first_frame_time is None:
-                                self.rtcm_first_frame_time = current_time
+    def validate_rtcm_data(self, data, now: float):
+        """Validate RTCM3 data (any bytes-like object) and count valid frames."""
+        buf = self.rtcm_buffer
+        end = self._rtcm_end
+        n = len(data)
+        if end + n > len(buf):
+            buf.extend(bytes(end + n - len(buf)))
+        buf[end:end + n] = data
+        end += n
+        
+        # Parse RTCM3 frames, then move the unconsumed tail to the front
+        msg_types = []
+        start = scan_rtcm_frames(buf, 0, end, msg_types)
+        remaining = end - start
+        if start and remaining:
+            buf[:remaining] = buf[start:end]
+        self._rtcm_end = remaining
+        
+        if msg_types:
+            with self.lock:
+                self.rtcm_valid_frames += len(msg_types)
+                seen = self._rtcm_types_seen
+                for msg_type in msg_types:
+                    if not seen[msg_type]:
+                        seen[msg_type] = 1
+                        bisect.insort(self.rtcm_msg_types, msg_type)
+                self.rtcm_last_received_time = now
+                if self.rtcm_first_frame_time is None:
+                    self.rtcm_first_frame_time = now
     
     def check_rtcm_reception_status(self, elapsed: float) -> Dict[str, any]:
         """Check if rover is receiving valid RTCM data."""
@@ -529,7 +647,7 @@ class RTKRoverComplete:
         
         with self.lock:
             status["rtcm_frames"] = self.rtcm_valid_frames
-            status["rtcm_msg_types"] = sorted(list(self.rtcm_msg_types))
+            status["rtcm_msg_types"] = self.rtcm_msg_types[:]
             status["rtcm_last_received"] = self.rtcm_last_received_time
             
             # Calculate RTCM data duration
@@ -564,23 +682,14 @@ class RTKRoverComplete:
                 num_sats = self.rover_data.get("num_sats", 0)
                 msg_types_count = len(status["rtcm_msg_types"])
                 
-                # Typical convergence times
-                typical_float_time = 60.0  # 1 minute
-                typical_fixed_time = 180.0  # 3 minutes
-                
-                # Adjust based on conditions
+                # Adjust typical convergence time based on conditions
                 if msg_types_count >= 4 and num_sats >= 12:
-                    # Good conditions
-                    remaining_float = max(0, typical_float_time - rtcm_time)
-                    remaining_fixed = max(0, typical_fixed_time - rtcm_time)
+                    tier = 2
                 elif msg_types_count >= 2 and num_sats >= 8:
-                    # Moderate conditions
-                    remaining_float = max(0, typical_float_time * 1.5 - rtcm_time)
-                    remaining_fixed = max(0, typical_fixed_time * 1.5 - rtcm_time)
+                    tier = 1
                 else:
-                    # Limited conditions
-                    remaining_float = max(0, typical_float_time * 2.0 - rtcm_time)
-                    remaining_fixed = max(0, typical_fixed_time * 2.0 - rtcm_time)
+                    tier = 0
+                remaining_float = max(0, RTK_FLOAT_TIME_BY_TIER[tier] - rtcm_time)
                 
                 if remaining_float > 0:
                     if remaining_float < 60:
@@ -606,263 +715,341 @@ class RTKRoverComplete:
         
         return status
     
-    def ntrip_forward_thread(self):
-        """Thread function to forward RTCM data from NTRIP to rover."""
-        print("📡 NTRIP forwarding thread started")
-        
+    def forward_ntrip_data(self) -> bool:
+        """Forward waiting NTRIP data to the rover. Returns False once the stream has ended."""
+        view = self._ntrip_view
         try:
-            while self.running:
-                try:
-                    chunk = self.ntrip_sock.recv(4096)
-                    
-                    if not chunk:
-                        print("⚠️  NTRIP connection closed by server.")
-                        break
-                    
-                    current_time = time.time()
-                    
-                    # Check for RTCM data gaps
-                    if self.rtcm_last_chunk_time is not None:
-                        gap_duration = current_time - self.rtcm_last_chunk_time
-                        if gap_duration > self.rtcm_data_gap_threshold:
-                            with self.lock:
-                                self.rtcm_gaps.append({
-                                    "start": self.rtcm_last_chunk_time - self.start_time,
-                                    "end": current_time - self.start_time,
-                                    "duration": gap_duration,
-                                })
-                    
-                    with self.lock:
-                        self.rtcm_received += len(chunk)
-                        self.rtcm_last_chunk_time = current_time
-                    
-                    # Validate RTCM data
-                    self.validate_rtcm_data(chunk)
-                    
-                    # Forward to rover
-                    try:
-                        self.rover_ser.write(chunk)
-                        with self.lock:
-                            self.rtcm_sent += len(chunk)
-                    except serial.SerialException as e:
-                        print(f"❌ Error writing to rover: {e}")
-                        break
-                
-                except socket.timeout:
-                    continue
-                except OSError as e:
-                    print(f"❌ NTRIP socket error: {e}")
-                    break
+            # Reads are capped so the rover write below stays within
+            # ROVER_WRITE_BUDGET; any remainder is picked up on the next pass
+            n = self.ntrip_sock.recv_into(view)
+            
+            if not n:
+                print("⚠️  NTRIP connection closed by server.")
+                return False
+            
+            chunk = view[:n]  # Zero-copy view of the bytes just received
+            
+            current_time = _now()
+            
+            # Only the NTRIP path writes rtcm_last_chunk_time, so the gap
+            # check can run before taking the lock
+            gap = None
+            if self.rtcm_last_chunk_time is not None:
+                gap_duration = current_time - self.rtcm_last_chunk_time
+                if gap_duration > self.rtcm_data_gap_threshold:
+                    gap = {
+                        "start": self.rtcm_last_chunk_time - self.start_time,
+                        "end": current_time - self.start_time,
+                        "duration": gap_duration,
+                    }
+            
+            with self.lock:
+                if gap is not None:
+                    self.rtcm_gaps.append(gap)
+                self.rtcm_received += n
+                self.rtcm_last_chunk_time = current_time
+            
+            # Validate RTCM data
+            self.validate_rtcm_data(chunk, current_time)
+            
+            # Forward to rover
+            try:
+                self.rover_ser.write(chunk)
+                with self.lock:
+                    self.rtcm_sent += n
+                self._dirty = True
+            except serial.SerialException as e:
+                print(f"❌ Error writing to rover: {e}")
+                return False
         
+        except socket.timeout:
+            pass
+        except OSError as e:
+            print(f"❌ NTRIP socket error: {e}")
+            return False
         except Exception as e:
-            print(f"❌ Error in NTRIP forwarding thread: {e}")
+            print(f"❌ Error forwarding NTRIP data: {e}")
+            return False
+        return True
     
-    def rover_read_thread(self):
-        """Thread function to read NMEA data from rover."""
-        print("📡 Rover reading thread started")
+    def process_nmea_line(self, raw: bytes, now: float):
+        """Parse one NMEA sentence from the rover and merge it into shared state."""
+        line = raw.decode("utf-8", errors="ignore")
+        
+        # Parse NMEA sentences outside the lock, running only the matching parser
+        gga_data = rmc_data = gsa_data = None
+        sentence = _NMEA_SENTENCE.get(raw[1:6])
+        if sentence == "GGA":
+            gga_data = self.parse_nmea_gga(raw)
+        elif sentence == "RMC":
+            rmc_data = self.parse_nmea_rmc(raw)
+        elif sentence == "GSA":
+            gsa_data = self.parse_nmea_gsa(raw)
+        vendor_msg = self.parse_vendor_messages(line)
+        
+        # Merge everything in a single lock acquisition
+        quality_change = None
+        with self.lock:
+            self.nmea_received += 1
+            
+            if gga_data:
+                quality = gga_data.get("quality", QUALITY_NO_FIX)
+                
+                # Track initial quality
+                if self.initial_quality is None:
+                    self.initial_quality = quality
+                
+                # Check for RTCM adoption signal via quality upgrade
+                self.check_rtcm_adoption_signal(quality, now)
+                
+                # Track quality changes
+                if quality != self.rover_data.get("quality"):
+                    quality_change = (self.rover_data.get("quality", QUALITY_NO_FIX), quality)
+                    self.last_quality_update_time = now
+                
+                self.rover_data.update(gga_data)
+                
+                if quality > self.best_quality:
+                    self.best_quality = quality
+                    elapsed = now - self.start_time
+                    if quality == QUALITY_RTK_FLOAT and self.rtk_float_time is None:
+                        self.rtk_float_time = elapsed
+                    if quality == QUALITY_RTK_FIXED and self.rtk_fixed_time is None:
+                        self.rtk_fixed_time = elapsed
+            
+            if rmc_data:
+                self.rover_data.update(rmc_data)
+            
+            if gsa_data:
+                self.rover_data.update(gsa_data)
+            
+            current_quality = self.rover_data.get("quality", QUALITY_NO_FIX)
         
+        if quality_change is not None:
+            self._quality_change_q.put({
+                "time": now - self.start_time,
+                "from": quality_change[0],
+                "to": quality_change[1],
+            })
+        
+        # Check for vendor-specific messages (takes the lock itself)
+        if vendor_msg:
+            self.check_rtcm_adoption_signal(current_quality, now, vendor_msg)
+    
+    def read_rover_data(self) -> bool:
+        """Read and parse waiting NMEA data from the rover. Returns False on a port error."""
+        buf = self._rover_buf
         try:
-            while self.running:
-                try:
-                    line = self.rover_ser.readline().decode("utf-8", errors="ignore").strip()
-                    if not line:
-                        continue
-                    
-                    with self.lock:
-                        self.nmea_received += 1
-                    
-                    # Parse NMEA sentences
-                    gga_data = self.parse_nmea_gga(line)
-                    if gga_data:
-                        with self.lock:
-                            quality = gga_data.get("quality", QUALITY_NO_FIX)
-                            
-                            # Track initial quality
-                            if self.initial_quality is None:
-                                self.initial_quality = quality
-                            
-                            # Check for RTCM adoption signal via quality upgrade
-                            self.check_rtcm_adoption_signal(quality)
-                            
-                            # Track quality changes
-                            current_time = time.time()
-                            if quality != self.rover_data.get("quality"):
-                                self.quality_changes.append({
-                                    "time": current_time - self.start_time,
-                                    "from": self.rover_data.get("quality", QUALITY_NO_FIX),
-                                    "to": quality,
-                                })
-                                self.last_quality_update_time = current_time
-                            
-                            self.rover_data.update(gga_data)
-                            
-                            if quality > self.best_quality:
-                                self.best_quality = quality
-                                elapsed = current_time - self.start_time
-                                if quality == QUALITY_RTK_FLOAT and self.rtk_float_time is None:
-                                    self.rtk_float_time = elapsed
-                                if quality == QUALITY_RTK_FIXED and self.rtk_fixed_time is None:
-                                    self.rtk_fixed_time = elapsed
-                            self.data_history.append(self.rover_data.copy())
-                    
-                    # Check for vendor-specific messages
-                    vendor_msg = self.parse_vendor_messages(line)
-                    if vendor_msg:
-                        self.check_rtcm_adoption_signal(
-                            self.rover_data.get("quality", QUALITY_NO_FIX),
-                            vendor_msg
-                        )
-                    
-                    rmc_data = self.parse_nmea_rmc(line)
-                    if rmc_data:
-                        with self.lock:
-                            self.rover_data.update(rmc_data)
-                    
-                    gsa_data = self.parse_nmea_gsa(line)
-                    if gsa_data:
-                        with self.lock:
-                            self.rover_data.update(gsa_data)
-                
-                except serial.SerialException as e:
-                    print(f"❌ Error reading from rover: {e}")
+            # Drain everything waiting in one read instead of readline()
+            chunk = self.rover_ser.read(self.rover_ser.in_waiting or 1)
+        except serial.SerialException as e:
+            print(f"❌ Error reading from rover: {e}")
+            return False
+        if not chunk:
+            return True
+        
+        try:
+            buf.extend(chunk)
+            now = _now()  # One clock read per serial chunk
+            
+            # Process every complete line, then trim the buffer once
+            start = 0
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl == -1:
                     break
-                except Exception as e:
+                raw = bytes(buf[start:nl]).strip()
+                start = nl + 1
+                if not raw:
                     continue
-        
+                try:
+                    self.process_nmea_line(raw, now)
+                except Exception:
+                    continue
+            if start:
+                del buf[:start]
+                self._dirty = True
+            elif len(buf) > NMEA_MAX_LINE:
+                # No line ending in sight, drop the garbage
+                buf.clear()
         except Exception as e:
-            print(f"❌ Error in rover reading thread: {e}")
+            print(f"❌ Error reading rover data: {e}")
+            return False
+        return True
+    
+    def rover_read_thread(self):
+        """Thread function to read NMEA data from a rover port the selector cannot watch."""
+        print("📡 Rover reading thread started")
+        while self.running and self.read_rover_data():
+            pass
+    
+    def _drain_quality_changes(self):
+        """Move quality changes queued by the reader thread into quality_changes."""
+        get = self._quality_change_q.get_nowait
+        while True:
+            try:
+                self.quality_changes.append(get())
+            except queue.Empty:
+                return
     
     def display_status(self):
         """Display current status."""
-        elapsed = time.time() - self.start_time
-        
-        # Clear screen
-        os.system("cls" if os.name == "nt" else "clear")
-        
-        print("=" * 70)
-        print("RTK Rover Complete - NTRIP Forwarding + RTK Monitoring")
-        print("=" * 70)
-        print(f"Runtime: {elapsed:.1f}s")
-        print()
+        elapsed = _now() - self.start_time
+        
+        # Nothing new from the worker threads: just tick the runtime
+        if not self._dirty and elapsed - self._last_redraw < DISPLAY_FULL_REFRESH:
+            sys.stdout.write(RUNTIME_LINE.format(elapsed))
+            sys.stdout.flush()
+            return
+        self._dirty = False
+        self._last_redraw = elapsed
+        
+        # Build the whole frame, then clear and redraw with a single write
+        lines = [CLEAR_SCREEN + "=" * 70]
+        out = lines.append
+        out("RTK Rover Complete - NTRIP Forwarding + RTK Monitoring")
+        out("=" * 70)
+        out(f"Runtime: {elapsed:.1f}s")
+        out("")
+        
+        # Snapshot shared state in one lock acquisition
+        rtcm_status = self.check_rtcm_reception_status(elapsed)
+        self._drain_quality_changes()
+        latest_change = self.quality_changes[-1] if self.quality_changes else None
+        with self.lock:
+            rtcm_received = self.rtcm_received
+            rtcm_sent = self.rtcm_sent
+            nmea_received = self.nmea_received
+            rtcm_last_chunk_time = self.rtcm_last_chunk_time
+            gap_count = len(self.rtcm_gaps)
+            total_gap_time = sum(g["duration"] for g in self.rtcm_gaps)
+            adoption_confirmed = self.rtcm_adoption_confirmed
+            adoption_time = self.rtcm_adoption_time
+            adoption_method = self.rtcm_adoption_method
+            vendor_count = len(self.vendor_messages_received)
+            vendor_preview = self.vendor_messages_received[:3]
+            rover_get = self.rover_data.get
+            quality = rover_get("quality", QUALITY_NO_FIX)
+            quality_name = rover_get("quality_name", "Unknown")
+            lat = rover_get("latitude")
+            lon = rover_get("longitude")
+            altitude = rover_get("altitude")
+            utc_time = rover_get("time")
+            num_sats = rover_get("num_sats", 0)
+            hdop = rover_get("hdop", 0.0)
+            pdop = rover_get("pdop", 0.0)
+            vdop = rover_get("vdop", 0.0)
+            speed_ms = rover_get("speed_ms")
+            track = rover_get("track")
+            best_quality = self.best_quality
+            rtk_fixed_time = self.rtk_fixed_time
+            rtk_float_time = self.rtk_float_time
         
         # RTCM Statistics
-        rx_rate = self.rtcm_received / elapsed if elapsed > 0 else 0
-        tx_rate = self.rtcm_sent / elapsed if elapsed > 0 else 0
-        print(f"📡 RTCM: Received {self.rtcm_received} bytes ({rx_rate:.1f} B/s) | "
-              f"Sent {self.rtcm_sent} bytes ({tx_rate:.1f} B/s)")
-        print(f"📨 NMEA: Received {self.nmea_received} messages")
+        rx_rate = rtcm_received / elapsed if elapsed > 0 else 0
+        tx_rate = rtcm_sent / elapsed if elapsed > 0 else 0
+        out(f"📡 RTCM: Received {rtcm_received} bytes ({rx_rate:.1f} B/s) | "
+              f"Sent {rtcm_sent} bytes ({tx_rate:.1f} B/s)")
+        out(f"📨 NMEA: Received {nmea_received} messages")
         
         # RTCM Reception Status
-        rtcm_status = self.check_rtcm_reception_status(elapsed)
-        print(f"\n🔍 RTCM Reception Status:")
-        print(f"   {rtcm_status['rtcm_status']}")
+        out(f"\n🔍 RTCM Reception Status:")
+        out(f"   {rtcm_status['rtcm_status']}")
         if rtcm_status['rtcm_valid']:
-            print(f"   Valid Frames: {rtcm_status['rtcm_frames']}")
+            out(f"   Valid Frames: {rtcm_status['rtcm_frames']}")
             if rtcm_status['rtcm_msg_types']:
                 msg_types_str = ", ".join(map(str, rtcm_status['rtcm_msg_types'][:10]))
                 if len(rtcm_status['rtcm_msg_types']) > 10:
                     msg_types_str += f" ... (+{len(rtcm_status['rtcm_msg_types']) - 10} more)"
-                print(f"   RTCM Types: {msg_types_str}")
+                out(f"   RTCM Types: {msg_types_str}")
             if rtcm_status['rtcm_duration'] > 0:
-                print(f"   RTCM Duration: {rtcm_status['rtcm_duration']:.1f}s")
+                out(f"   RTCM Duration: {rtcm_status['rtcm_duration']:.1f}s")
         if rtcm_status['rtcm_last_received']:
             time_since = elapsed - (rtcm_status['rtcm_last_received'] - self.start_time)
             if time_since < 5.0:
-                print(f"   Last Valid Frame: {time_since:.1f}s ago ✅")
+                out(f"   Last Valid Frame: {time_since:.1f}s ago ✅")
             elif time_since < 30.0:
-                print(f"   Last Valid Frame: {time_since:.1f}s ago ⚠️")
+                out(f"   Last Valid Frame: {time_since:.1f}s ago ⚠️")
             else:
-                print(f"   Last Valid Frame: {time_since:.1f}s ago ❌ (Data stream may be interrupted)")
+                out(f"   Last Valid Frame: {time_since:.1f}s ago ❌ (Data stream may be interrupted)")
         
         # RTCM Data Stream Health
-        with self.lock:
-            if self.rtcm_last_chunk_time:
-                time_since_chunk = elapsed - (self.rtcm_last_chunk_time - self.start_time)
-                if time_since_chunk > 10.0:
-                    print(f"   ⚠️  RTCM Stream Gap: {time_since_chunk:.1f}s since last chunk")
-                    print(f"      → Check NTRIP connection or base station")
-            
-            if self.rtcm_gaps:
-                total_gap_time = sum(g["duration"] for g in self.rtcm_gaps)
-                gap_percentage = (total_gap_time / elapsed * 100) if elapsed > 0 else 0
-                print(f"   📊 Data Gaps: {len(self.rtcm_gaps)} gaps, {total_gap_time:.1f}s total ({gap_percentage:.1f}%)")
-                if gap_percentage > 20:
-                    print(f"      ⚠️  High gap percentage - RTCM stream unstable")
+        if rtcm_last_chunk_time:
+            time_since_chunk = elapsed - (rtcm_last_chunk_time - self.start_time)
+            if time_since_chunk > 10.0:
+                out(f"   ⚠️  RTCM Stream Gap: {time_since_chunk:.1f}s since last chunk")
+                out(f"      → Check NTRIP connection or base station")
+        
+        if gap_count:
+            gap_percentage = (total_gap_time / elapsed * 100) if elapsed > 0 else 0
+            out(f"   📊 Data Gaps: {gap_count} gaps, {total_gap_time:.1f}s total ({gap_percentage:.1f}%)")
+            if gap_percentage > 20:
+                out(f"      ⚠️  High gap percentage - RTCM stream unstable")
         
         # RTCM → GNSS Adoption Confirmation Signal
-        print(f"\n📡 RTCM → GNSS Adoption Confirmation:")
-        with self.lock:
-            if self.rtcm_adoption_confirmed:
-                print(f"   ✅ CONFIRMED: Rover is using RTCM data")
-                if self.rtcm_adoption_time:
-                    print(f"   Confirmed at: {self.rtcm_adoption_time:.1f}s")
-                if self.rtcm_adoption_method:
-                    method_display = self.rtcm_adoption_method.replace("_", " ").title()
-                    print(f"   Method: {method_display}")
-                
-                # Show quality-based confirmation
-                current_quality = self.rover_data.get("quality", QUALITY_NO_FIX)
-                if current_quality in [QUALITY_DGPS, QUALITY_RTK_FLOAT, QUALITY_RTK_FIXED]:
-                    quality_name = QUALITY_NAMES.get(current_quality, "Unknown")
-                    print(f"   Signal: NMEA GGA Quality = {current_quality} ({quality_name})")
-                
-                # Show vendor messages if any
-                if self.vendor_messages_received:
-                    print(f"   Vendor Messages: {len(self.vendor_messages_received)} detected")
-                    for i, vmsg in enumerate(self.vendor_messages_received[:3], 1):
-                        vendor = vmsg.get("vendor", "Unknown")
-                        msg_type = vmsg.get("message_type", "")[:20]
-                        print(f"      {i}. {vendor}: {msg_type}")
-            else:
-                print(f"   ⏳ PENDING: Waiting for adoption confirmation signal...")
-                print(f"   Expected signals:")
-                print(f"      - NMEA GGA Quality = 2 (DGPS), 4 (RTK Fixed), or 5 (RTK Float)")
-                print(f"      - Vendor-specific messages with RTK keywords")
+        out(f"\n📡 RTCM → GNSS Adoption Confirmation:")
+        if adoption_confirmed:
+            out(f"   ✅ CONFIRMED: Rover is using RTCM data")
+            if adoption_time:
+                out(f"   Confirmed at: {adoption_time:.1f}s")
+            if adoption_method:
+                method_display = adoption_method.replace("_", " ").title()
+                out(f"   Method: {method_display}")
+            
+            # Show quality-based confirmation
+            if quality in (QUALITY_DGPS, QUALITY_RTK_FLOAT, QUALITY_RTK_FIXED):
+                signal_name = QUALITY_NAMES.get(quality, "Unknown")
+                out(f"   Signal: NMEA GGA Quality = {quality} ({signal_name})")
+            
+            # Show vendor messages if any
+            if vendor_count:
+                out(f"   Vendor Messages: {vendor_count} detected")
+                for i, vmsg in enumerate(vendor_preview, 1):
+                    vendor = vmsg.get("vendor", "Unknown")
+                    msg_type = vmsg.get("message_type", "")[:20]
+                    out(f"      {i}. {vendor}: {msg_type}")
+        else:
+            out(f"   ⏳ PENDING: Waiting for adoption confirmation signal...")
+            out(f"   Expected signals:")
+            out(f"      - NMEA GGA Quality = 2 (DGPS), 4 (RTK Fixed), or 5 (RTK Float)")
+            out(f"      - Vendor-specific messages with RTK keywords")
         
         # RTK Convergence Estimate
         if rtcm_status['rtk_convergence_estimate']:
-            print(f"\n   ⏳ {rtcm_status['rtk_convergence_estimate']}")
+            out(f"\n   ⏳ {rtcm_status['rtk_convergence_estimate']}")
         
         # Quality change indicator
-        with self.lock:
-            if self.quality_changes:
-                latest_change = self.quality_changes[-1]
-                from_name = QUALITY_NAMES.get(latest_change['from'], 'Unknown')
-                to_name = QUALITY_NAMES.get(latest_change['to'], 'Unknown')
-                if latest_change['from'] != latest_change['to']:
-                    print(f"   📈 Quality Change: {from_name} → {to_name} "
-                          f"(at {latest_change['time']:.1f}s)")
+        if latest_change:
+            from_name = QUALITY_NAMES.get(latest_change['from'], 'Unknown')
+            to_name = QUALITY_NAMES.get(latest_change['to'], 'Unknown')
+            if latest_change['from'] != latest_change['to']:
+                out(f"   📈 Quality Change: {from_name} → {to_name} "
+                      f"(at {latest_change['time']:.1f}s)")
         
         # RTCM Data Rate Check
-        with self.lock:
-            if self.rtcm_received > 0 and elapsed > 0:
-                rtcm_rate = self.rtcm_received / elapsed
-                if rtcm_rate < 50:
-                    print(f"   ⚠️  RTCM Rate Low: {rtcm_rate:.1f} B/s (expected 200-500 B/s)")
-                elif rtcm_rate > 1000:
-                    print(f"   ⚠️  RTCM Rate High: {rtcm_rate:.1f} B/s (check connection)")
-                else:
-                    print(f"   ✅ RTCM Rate Normal: {rtcm_rate:.1f} B/s")
-        print()
+        if rtcm_received > 0 and elapsed > 0:
+            rtcm_rate = rtcm_received / elapsed
+            if rtcm_rate < 50:
+                out(f"   ⚠️  RTCM Rate Low: {rtcm_rate:.1f} B/s (expected 200-500 B/s)")
+            elif rtcm_rate > 1000:
+                out(f"   ⚠️  RTCM Rate High: {rtcm_rate:.1f} B/s (check connection)")
+            else:
+                out(f"   ✅ RTCM Rate Normal: {rtcm_rate:.1f} B/s")
+        out("")
         
         # RTK Status
-        with self.lock:
-            quality = self.rover_data.get("quality", QUALITY_NO_FIX)
-            quality_name = self.rover_data.get("quality_name", "Unknown")
-            best_quality = self.best_quality
-        
         if quality == QUALITY_RTK_FIXED:
             status_icon = "🟢"
             status_text = "RTK FIXED (cm-level)"
             rtk_hint = ""
-            if self.rtk_fixed_time:
-                print(f"⏱️  RTK Fixed achieved in {self.rtk_fixed_time:.1f}s")
+            if rtk_fixed_time:
+                out(f"⏱️  RTK Fixed achieved in {rtk_fixed_time:.1f}s")
         elif quality == QUALITY_RTK_FLOAT:
             status_icon = "🟡"
             status_text = "RTK FLOAT (dm-level)"
             rtk_hint = "💡 RTK Float - Waiting for RTK Fixed convergence..."
-            if self.rtk_float_time:
-                print(f"⏱️  RTK Float achieved in {self.rtk_float_time:.1f}s")
+            if rtk_float_time:
+                out(f"⏱️  RTK Float achieved in {rtk_float_time:.1f}s")
         elif quality == QUALITY_GPS:
             status_icon = "🔵"
             status_text = "GPS Fix"
@@ -876,72 +1063,86 @@ class RTKRoverComplete:
             status_text = "No Fix"
             rtk_hint = "❌ No fix - Check antenna and satellite visibility"
         
-        print(f"Status: {status_icon} {status_text}")
-        print(f"Quality Code: {quality} ({quality_name})")
+        out(f"Status: {status_icon} {status_text}")
+        out(f"Quality Code: {quality} ({quality_name})")
         
         if best_quality > quality:
             best_name = QUALITY_NAMES.get(best_quality, "Unknown")
-            print(f"Best Achieved: {best_name} (Quality {best_quality})")
+            out(f"Best Achieved: {best_name} (Quality {best_quality})")
         
         if rtk_hint:
-            print(f"\n{rtk_hint}")
-        print()
+            out(f"\n{rtk_hint}")
+        out("")
         
         # Position
-        with self.lock:
-            lat = self.rover_data.get("latitude")
-            lon = self.rover_data.get("longitude")
-        
         if lat is not None and lon is not None:
-            print(f"Position: {lat:.8f}°N, {lon:.8f}°E")
+            out(f"Position: {lat:.8f}°N, {lon:.8f}°E")
         else:
-            print("Position: No data")
+            out("Position: No data")
         
         # Other data
-        with self.lock:
-            altitude = self.rover_data.get("altitude")
-            utc_time = self.rover_data.get("time")
-            num_sats = self.rover_data.get("num_sats", 0)
-            hdop = self.rover_data.get("hdop", 0.0)
-            pdop = self.rover_data.get("pdop", 0.0)
-            vdop = self.rover_data.get("vdop", 0.0)
-            speed_ms = self.rover_data.get("speed_ms")
-            track = self.rover_data.get("track")
-        
         if altitude is not None:
-            print(f"Altitude: {altitude:.2f} m (MSL)")
+            out(f"Altitude: {altitude:.2f} m (MSL)")
         if utc_time:
-            print(f"UTC Time: {utc_time}")
-        print(f"Satellites: {num_sats}")
+            out(f"UTC Time: {utc_time}")
+        out(f"Satellites: {num_sats}")
         if hdop > 0:
-            print(f"HDOP: {hdop:.2f}")
+            out(f"HDOP: {hdop:.2f}")
         if pdop > 0:
-            print(f"PDOP: {pdop:.2f}")
+            out(f"PDOP: {pdop:.2f}")
         if vdop > 0:
-            print(f"VDOP: {vdop:.2f}")
+            out(f"VDOP: {vdop:.2f}")
         if speed_ms is not None:
-            print(f"Speed: {speed_ms:.2f} m/s ({speed_ms * 3.6:.2f} km/h)")
+            out(f"Speed: {speed_ms:.2f} m/s ({speed_ms * 3.6:.2f} km/h)")
         if track is not None:
-            print(f"Track: {track:.1f}°")
+            out(f"Track: {track:.1f}°")
+        
+        out("")
+        out("Press Ctrl+C to stop")
+        out("=" * 70)
         
-        print()
-        print("Press Ctrl+C to stop")
-        print("=" * 70)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
-    def display_thread(self):
-        """Thread function to update display periodically."""
-        display_interval = self.config.get("display_interval", 0.5)
+    def event_loop(self):
+        """Forward NTRIP data, read the rover and refresh the display from one selector."""
+        sel = selectors.DefaultSelector()
+        sel.register(self.ntrip_sock, selectors.EVENT_READ, self.forward_ntrip_data)
         
-        while self.running:
-            self.display_status()
-            time.sleep(display_interval)
+        # pyserial only exposes a selectable fd on POSIX; on Windows fileno()
+        # raises, and the rover port is read by a helper thread instead
+        try:
+            sel.register(self.rover_ser, selectors.EVENT_READ, self.read_rover_data)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            self._rover_thread = threading.Thread(target=self.rover_read_thread, daemon=True)
+            self._rover_thread.start()
+        
+        display_interval = self._display_interval
+        next_display = _now()
+        try:
+            while self.running:
+                timeout = max(0.0, next_display - _now())
+                if sel.get_map():
+                    for key, _mask in sel.select(timeout):
+                        if not key.data():
+                            sel.unregister(key.fileobj)
+                elif self._rover_thread is not None and self._rover_thread.is_alive():
+                    # Only the reader thread is left; wake as soon as it ends
+                    self._rover_thread.join(timeout)
+                else:
+                    # Neither the NTRIP stream nor the rover is readable any more
+                    break
+                
+                now = _now()
+                if now >= next_display:
+                    self.display_status()
+                    next_display = now + display_interval
+        finally:
+            sel.close()
     
     def run(self):
         """Main run function."""
-        print("=" * 70)
-        print("RTK Rover Complete - Starting...")
-        print("=" * 70)
-        print()
+        sys.stdout.write("=" * 70 + "\nRTK Rover Complete - Starting...\n" + "=" * 70 + "\n\n")
         
         # Determine rover port
         rover_port = self.config.get("rover_port")
@@ -984,30 +1185,22 @@ class RTKRoverComplete:
             except Exception as e:
                 print(f"⚠️  Error sending initial data: {e}")
         
-        # Start threads
+        # Start forwarding and monitoring
         self.running = True
-        self.start_time = time.time()
-        
-        ntrip_thread = threading.Thread(target=self.ntrip_forward_thread, daemon=True)
-        rover_thread = threading.Thread(target=self.rover_read_thread, daemon=True)
-        display_thread = threading.Thread(target=self.display_thread, daemon=True)
-        
-        ntrip_thread.start()
-        rover_thread.start()
-        display_thread.start()
+        self.start_time = _now()
         
-        print("\n✅ All threads started. Monitoring RTK status...")
+        print("\n✅ Forwarding started. Monitoring RTK status...")
         print("Press Ctrl+C to stop.\n")
         
         try:
-            # Wait for threads
-            while self.running:
-                time.sleep(1)
+            self.event_loop()
         except KeyboardInterrupt:
             print("\n\n⚠️  Interrupted by user.")
         finally:
             self.running = False
-            time.sleep(0.5)  # Give threads time to finish
+            if self._rover_thread is not None:
+                # A read can block for up to rover_timeout before the reader sees running
+                self._rover_thread.join(self.config.get("rover_timeout", 1.0) + 0.5)
             
             try:
                 self.ntrip_sock.close()
@@ -1019,7 +1212,7 @@ class RTKRoverComplete:
             except Exception:
                 pass
             
-            elapsed = time.time() - self.start_time
+            elapsed = _now() - self.start_time
             print(f"\n📊 Final Statistics:")
             print(f"   Runtime: {elapsed:.1f}s")
             print(f"   RTCM received: {self.rtcm_received} bytes")
@@ -1035,6 +1228,7 @@ class RTKRoverComplete:
     def write_summary_log(self, elapsed: float):
         """Write summary log file."""
         os.makedirs(LOG_DIR, exist_ok=True)
+        self._drain_quality_changes()
         
         ts = datetime.now()
         log_filename = ts.strftime("rtk_rover_complete_log_%Y%m%d_%H%M%S.txt")
@@ -1095,14 +1289,14 @@ class RTKRoverComplete:
                     lines.append(f"  Expected      : NMEA GGA Quality = 2/4/5 or vendor messages")
             lines.append("")
             
-            if self.data_history:
-                best_quality = max((d.get("quality", 0) for d in self.data_history), default=0)
-                best_name = QUALITY_NAMES.get(best_quality, "Unknown")
+            if self.initial_quality is not None:  # At least one GGA fix was parsed
+                name_of = QUALITY_NAMES.get
+                best_quality = self.best_quality  # Running max kept by the NMEA parser
+                best_name = name_of(best_quality, "Unknown")
                 lines.append(f"Best Fix   : {best_name} (Quality {best_quality})")
                 
-                if self.initial_quality is not None:
-                    initial_name = QUALITY_NAMES.get(self.initial_quality, "Unknown")
-                    lines.append(f"Initial Fix: {initial_name} (Quality {self.initial_quality})")
+                initial_name = name_of(self.initial_quality, "Unknown")
+                lines.append(f"Initial Fix: {initial_name} (Quality {self.initial_quality})")
                 
                 if self.rtk_float_time:
                     lines.append(f"RTK Float  : Achieved in {self.rtk_float_time:.1f}s")
@@ -1114,13 +1308,22 @@ class RTKRoverComplete:
                     lines.append("")
                     lines.append("Quality Changes:")
                     for change in self.quality_changes:
-                        from_name = QUALITY_NAMES.get(change['from'], 'Unknown')
-                        to_name = QUALITY_NAMES.get(change['to'], 'Unknown')
+                        from_name = name_of(change['from'], 'Unknown')
+                        to_name = name_of(change['to'], 'Unknown')
                         lines.append(f"  {change['time']:.1f}s: {from_name} → {to_name}")
         
+        # Encode once and write with a single unbuffered write (binary mode,
+        # platform line endings as text mode would produce)
+        data = (os.linesep.join(lines) + os.linesep).encode("utf-8")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("\n".join(lines) + "\n")
+            fd = os.open(filename, flags, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             print(f"📝 Summary log written to {filename}")
         except OSError as e:
             print(f"⚠️  Failed to write log file: {e}")
@@ -1128,6 +1331,10 @@ class RTKRoverComplete:
 
 def main():
     """Main entry point."""
+    # Enable ANSI escape processing on the Windows console
+    if os.name == "nt":
+        os.system("")
+    
     # Load configuration
     config_file = CONFIG_FILE
     if len(sys.argv) > 1:
@@ -1136,8 +1343,8 @@ def main():
     config = DEFAULT_CONFIG.copy()
     if os.path.exists(config_file):
         try:
-            with open(config_file, "r", encoding="utf-8") as f:
-                user_config = json.load(f)
+            with open(config_file, "rb") as f:
+                user_config = _json_loads(f.read())
                 config.update(user_config)
         except Exception as e:
             print(f"⚠️  Error loading config: {e}, using defaults")
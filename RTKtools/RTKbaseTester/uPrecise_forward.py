@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import selectors
 import socket
 import threading
 import time
@@ -16,16 +17,28 @@ FLAG_EXCLUSIVE = 4
 FLAG_BLOCKING = 8
 FLAG_MULTI = 16
 
+EMPTY_PAYLOAD = b"\x00" * 70
+
+_shutdown = threading.Event()  # Set on Ctrl+C or when a forwarding loop exits
+
+
+# Byte -> itself if printable, else "." (CR/LF/TAB too, so each chunk prints on one line)
+_ASCII_TABLE = bytes(b if b >= 0x20 and chr(b) in string.printable else ord(".") for b in range(256))
+
 
 def format_ascii(data):
-    printable = set(string.printable)
-    return "".join(chr(b) if chr(b) in printable else "." for b in data)
+    # bytes() is a no-op for bytes and lets memoryview/bytearray input through
+    return bytes(data).translate(_ASCII_TABLE).decode("ascii")
 
 def is_all_zero(data):
-    for b in data:
-        if b != 0:
-            return False
-    return True
+    return data.count(0) == len(data)
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 
 class TcpBridge:
@@ -38,12 +51,13 @@ class TcpBridge:
         self.running = False
 
     def start(self):
+        """Bind and listen; accepting is driven by the TCP -> GPS2 selector."""
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server.bind((self.host, self.port))
         self.server.listen(1)
+        self.server.setblocking(False)
         self.running = True
-        threading.Thread(target=self._accept_loop, daemon=True).start()
 
     def stop(self):
         self.running = False
@@ -54,18 +68,31 @@ class TcpBridge:
             pass
         self.close_client()
 
-    def _accept_loop(self):
-        while self.running:
-            try:
-                client, _addr = self.server.accept()
-                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                with self.client_lock:
-                    self.close_client()
-                    self.client = client
-            except Exception:
-                time.sleep(0.2)
+    def accept(self):
+        """Accept a pending client, replacing any existing one."""
+        try:
+            client, _addr = self.server.accept()
+        except OSError:
+            # Nothing pending, or the client reset before we got to it
+            return
+        try:
+            client.setblocking(True)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            client.close()
+            return
+        with self.client_lock:
+            self._close_client()
+            self.client = client
 
-    def close_client(self):
+    def close_client(self, client=None):
+        """Close the current client, or only `client` if it is still the current one."""
+        with self.client_lock:
+            if client is None or client is self.client:
+                self._close_client()
+
+    def _close_client(self):
+        # Caller holds client_lock
         if self.client:
             try:
                 self.client.close()
@@ -78,24 +105,42 @@ class TcpBridge:
             return self.client
 
 
-def send_serial_bytes(mav, device, data, baud, exclusive):
+def send_serial_bytes(mav, device, data, baud, exclusive, batch=8, batch_writes=False):
     offset = 0
+    packets = 0
     flags = FLAG_EXCLUSIVE if exclusive else 0
+    view = memoryview(data)  # Full chunks are passed as zero-copy slices
+    pending = bytearray()  # Encoded frames of the current batch (batch_writes only)
     while offset < len(data):
-        chunk = data[offset:offset + 70]
+        chunk = view[offset:offset + 70]
         count = len(chunk)
         if count < 70:
-            chunk = chunk + b"\x00" * (70 - count)
-        mav.mav.serial_control_send(
-            device,
-            flags,
-            0,
-            baud,
-            count,
-            chunk,
-        )
+            chunk = bytes(chunk) + EMPTY_PAYLOAD[count:]
+        if batch_writes:
+            # Encode like MAVLink.send() would, but defer the write
+            frame = mav.mav.serial_control_encode(device, flags, 0, baud, count, chunk).pack(mav.mav)
+            pending += frame
+            mav.mav.seq = (mav.mav.seq + 1) % 256
+            mav.mav.total_packets_sent += 1
+            mav.mav.total_bytes_sent += len(frame)
+        else:
+            mav.mav.serial_control_send(
+                device,
+                flags,
+                0,
+                baud,
+                count,
+                chunk,
+            )
         offset += count
-        time.sleep(0.01)
+        packets += 1
+        # Pace the link once per batch of packets rather than after each one
+        if packets % batch == 0 or offset >= len(data):
+            if pending:
+                mav.write(bytes(pending))
+                pending.clear()
+            if _shutdown.wait(0.01):
+                return
 
 
 def main():
@@ -109,6 +154,10 @@ def main():
     parser.add_argument("--tcp-host", default="127.0.0.1", help="TCP listen host")
     parser.add_argument("--tcp-port", type=int, default=500, help="TCP listen port")
     parser.add_argument("--request-interval-ms", type=int, default=50, help="Poll interval")
+    parser.add_argument("--send-batch", type=positive_int, default=8,
+                        help="SERIAL_CONTROL packets sent to GPS2 per 10 ms pause")
+    parser.add_argument("--batch-writes", action="store_true",
+                        help="Write each batch of SERIAL_CONTROL packets to the link in one call")
     parser.add_argument("--show-gps2", action="store_true", help="Print GPS2 data received")
     parser.add_argument("--show-tcp", action="store_true", help="Print TCP data sent to GPS2")
     parser.add_argument("--show-hex", action="store_true", help="Print GPS2 data as hex")
@@ -148,40 +197,60 @@ def main():
         commands = queue_commands()
         if not commands:
             return
-        time.sleep(1.0)
+        if _shutdown.wait(1.0):
+            return
         for cmd in commands:
             payload = cmd
             if not payload.endswith("\r\n"):
                 payload += "\r\n"
             print(f"[SEND -> GPS2] {cmd}")
             send_serial_bytes(mav, args.device, payload.encode("ascii", "ignore"),
-                              args.gps_baud, exclusive=not args.no_exclusive)
-            time.sleep(0.2)
+                              args.gps_baud, exclusive=not args.no_exclusive,
+                              batch=args.send_batch, batch_writes=args.batch_writes)
+            if _shutdown.wait(0.2):
+                return
 
     def mavlink_loop():
         next_request = 0
         last_empty_print = 0
         last_magic_hint = 0
-        exclusive = not args.no_exclusive
-        while True:
-            now = time.time()
+        poll_flags = FLAG_RESPOND | FLAG_MULTI
+        if not args.no_exclusive:
+            poll_flags |= FLAG_EXCLUSIVE
+        request_interval = args.request_interval_ms / 1000.0
+        # Locals for the per-message path
+        target_device = args.device
+        recv_match = mav.recv_match
+        serial_control_send = mav.mav.serial_control_send
+        while not _shutdown.is_set():
+            # One monotonic read per pass serves the poll deadline and both hint timers
+            now = time.monotonic()
             if now >= next_request:
-                flags = FLAG_RESPOND | FLAG_MULTI
-                if exclusive:
-                    flags |= FLAG_EXCLUSIVE
-                mav.mav.serial_control_send(
-                    args.device,
-                    flags,
+                serial_control_send(
+                    target_device,
+                    poll_flags,
                     10,
                     args.gps_baud,
                     0,
-                    b"\x00" * 70,
+                    EMPTY_PAYLOAD,
                 )
-                next_request = now + (args.request_interval_ms / 1000.0)
+                next_request = now + request_interval
 
-            msg = mav.recv_match(type="SERIAL_CONTROL", blocking=False)
-            if msg is not None and getattr(msg, "count", 0) > 0 and msg.device == args.device:
-                data = bytes(msg.data[: msg.count])
+            # Block on the link until a message arrives or the next poll is due.
+            # Without a selectable fd (serial ports on Windows) pymavlink sleeps
+            # instead of waiting on the port, so keep those waits short.
+            wait = next_request - now
+            if mav.fd is None:
+                wait = min(wait, 0.01)
+            if wait > 0:
+                msg = recv_match(type="SERIAL_CONTROL", blocking=True, timeout=wait)
+            else:
+                msg = recv_match(type="SERIAL_CONTROL", blocking=False)
+            # recv_match(type=...) only returns SERIAL_CONTROL, so count and device always exist
+            if msg is not None and msg.count > 0 and msg.device == target_device:
+                # msg.data is a list of 70 ints; convert it once and trim the
+                # bytes (a full 70-byte slice returns the same object)
+                data = bytes(msg.data)[: msg.count]
                 if args.show_meta:
                     print(f"[SERIAL_CONTROL] device={msg.device} count={msg.count} flags=0x{msg.flags:02x}")
                 if args.show_gps2:
@@ -193,7 +262,8 @@ def main():
                         print(f"[GPS2 -> TCP] ({len(data)} bytes) {format_ascii(data)}")
                 if args.show_hex and not is_all_zero(data):
                     print(f"[GPS2 -> TCP][hex] {data.hex(' ')}")
-                if len(data) > 0 and all(b == data[0] for b in data) and data[0] in (0xFE, 0xFD):
+                # Cheap magic-byte test first; only then count in C
+                if data and data[0] in (0xFE, 0xFD) and data.count(data[0]) == len(data):
                     if now - last_magic_hint >= 1.0:
                         print("[hint] Got MAVLink magic bytes. You may be reading a telemetry port, not GPS2.")
                         last_magic_hint = now
@@ -202,36 +272,76 @@ def main():
                     try:
                         client.sendall(data)
                     except Exception:
-                        bridge.close_client()
-            time.sleep(0.005)
+                        bridge.close_client(client)
 
     def tcp_to_gps_loop():
-        while True:
+        sel = selectors.DefaultSelector()
+        sel.register(bridge.server, selectors.EVENT_READ)
+        registered = None
+        while not _shutdown.is_set():
+            # Follow client changes (new accept, or closed by the MAVLink thread)
             client = bridge.get_client()
-            if client is None:
-                time.sleep(0.05)
-                continue
+            if client is not registered:
+                if registered is not None:
+                    try:
+                        sel.unregister(registered)
+                    except (KeyError, ValueError):
+                        pass
+                    registered = None
+                if client is not None:
+                    try:
+                        sel.register(client, selectors.EVENT_READ)
+                        registered = client
+                    except (OSError, ValueError):
+                        # Being closed by the MAVLink thread; re-sync on the next pass
+                        pass
             try:
-                data = client.recv(2048)
-                if not data:
-                    bridge.close_client()
+                events = sel.select(timeout=1.0)
+            except OSError:
+                # Client socket closed under us; re-sync on the next pass
+                continue
+            for key, _mask in events:
+                if key.fileobj is bridge.server:
+                    bridge.accept()
                     continue
-                if args.show_tcp:
-                    print(f"[TCP -> GPS2] {format_ascii(data)}")
-                send_serial_bytes(mav, args.device, data, args.gps_baud, exclusive=not args.no_exclusive)
-            except Exception:
-                bridge.close_client()
+                if key.fileobj is not bridge.get_client():
+                    # Replaced by an accept earlier in this batch; its
+                    # registration is dropped on the next pass
+                    continue
+                try:
+                    data = key.fileobj.recv(2048)
+                    if not data:
+                        bridge.close_client(key.fileobj)
+                        continue
+                    if args.show_tcp:
+                        print(f"[TCP -> GPS2] {format_ascii(data)}")
+                    send_serial_bytes(mav, args.device, data, args.gps_baud,
+                                      exclusive=not args.no_exclusive, batch=args.send_batch,
+                                      batch_writes=args.batch_writes)
+                except Exception:
+                    bridge.close_client(key.fileobj)
 
-    threading.Thread(target=mavlink_loop, daemon=True).start()
-    threading.Thread(target=tcp_to_gps_loop, daemon=True).start()
+    def run_forwarder(loop):
+        try:
+            loop()
+        finally:
+            _shutdown.set()
+
+    threading.Thread(target=run_forwarder, args=(mavlink_loop,), daemon=True).start()
+    threading.Thread(target=run_forwarder, args=(tcp_to_gps_loop,), daemon=True).start()
     threading.Thread(target=send_commands, daemon=True).start()
 
+    # Event.wait() cannot be interrupted by Ctrl+C on Windows, so wake
+    # periodically there; elsewhere block until a forwarding loop exits
+    timeout = 1.0 if sys.platform == "win32" else None
     try:
-        while True:
-            time.sleep(1)
+        while not _shutdown.wait(timeout):
+            pass
+        print("Forwarding loop stopped.")
     except KeyboardInterrupt:
+        _shutdown.set()
         print("Stopping...")
-        bridge.stop()
+    bridge.stop()
 
 
 if __name__ == "__main__":
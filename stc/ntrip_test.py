@@ -1,12 +1,23 @@
 import base64
+import functools
+import heapq
 import os
+import queue
+import re
 import socket
+import struct
 import sys
+import threading
 import time
-from collections import Counter
+from operator import itemgetter
 from typing import Dict, Tuple, Optional
 from datetime import datetime
 
+try:
+    import crcmod  # Optional C implementation of the CRC below
+except ImportError:
+    crcmod = None
+
 
 # Default configuration matching your XTRTK "本地差分服务"
 HOST = "192.168.137.172"  # You can override from CLI: python ntrip_test.py <ip>
@@ -20,26 +31,79 @@ DEBUG = True
 
 # Expected RTCM message types from your config
 EXPECTED_TYPES = {1074, 1084, 1094, 1124, 1005, 1006, 1033}
+_EXPECTED_SORTED = tuple(sorted(EXPECTED_TYPES))  # Report order
 
 # Log directory path
 LOG_DIR = r"C:\Users\oxpas\Documents\GitHub\DroneDevTools\stc\logs"
 
+# Bytes per socket read (1024-16384 are sensible values)
+RECV_CHUNK = 4096
+
+# Largest RTCM3 frame: 3-byte header + 1023-byte payload + 3-byte CRC
+RTCM_MAX_FRAME = 1029
+
+# Big-endian 16-bit read straight out of the receive buffer.
+# RTCM3 framing: 0xD3 sync, 6 reserved bits + 10-bit length, payload, 3-byte
+# CRC. The first 12 bits of the payload are the message number.
+_UNPACK_H = struct.Struct(">H").unpack_from
+
+# Control byte other than TAB/LF/CR: where binary data starts in a header
+_CONTROL_BYTE = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# RTCM3 CRC-24Q polynomial
+CRC24Q_POLY = 0x1864CFB
+
+
+def _make_crc24q_table() -> tuple:
+    """Build the byte-wise CRC-24Q lookup table."""
+    table = []
+    for i in range(256):
+        crc = i << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= CRC24Q_POLY
+        table.append(crc & 0xFFFFFF)
+    return tuple(table)
+
+
+_CRC24Q_TABLE = _make_crc24q_table()
+
+
+def _crc24q_py(data) -> int:
+    """Compute the RTCM3 CRC-24Q of a bytes-like object."""
+    crc = 0
+    table = _CRC24Q_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ table[(crc >> 16) ^ b]
+    return crc
+
+
+if crcmod is not None:
+    crc24q = crcmod.mkCrcFun(CRC24Q_POLY, initCrc=0, rev=False)
+else:
+    crc24q = _crc24q_py
+
+
+@functools.lru_cache(maxsize=None)
+def _basic_auth(user: str, password: str) -> bytes:
+    """Base64 credentials for the Authorization header."""
+    return base64.b64encode(f"{user}:{password}".encode("ascii"))
+
 
 def build_ntrip_request(host: str, mountpoint: str, user: str, password: str) -> bytes:
     """Build a minimal NTRIP v2 GET request."""
-    auth = base64.b64encode(f"{user}:{password}".encode("ascii")).decode("ascii")
     # Use HTTP/1.0 for simplicity; most casters accept it.
-    lines = [
-        f"GET /{mountpoint} HTTP/1.0",
-        f"Host: {host}",
-        "User-Agent: NTRIP PythonClient/1.0",
-        f"Authorization: Basic {auth}",
-        "Ntrip-Version: Ntrip/2.0",
-        "Connection: close",
-        "",
-        "",
-    ]
-    request = "\r\n".join(lines).encode("ascii")
+    request = b"\r\n".join((
+        b"GET /" + mountpoint.encode("ascii") + b" HTTP/1.0",
+        b"Host: " + host.encode("ascii"),
+        b"User-Agent: NTRIP PythonClient/1.0",
+        b"Authorization: Basic " + _basic_auth(user, password),
+        b"Ntrip-Version: Ntrip/2.0",
+        b"Connection: close",
+        b"",
+        b"",
+    ))
 
     if DEBUG:
         print("---- NTRIP request being sent ----")
@@ -49,25 +113,13 @@ def build_ntrip_request(host: str, mountpoint: str, user: str, password: str) ->
     return request
 
 
-def parse_rtcm3_message_type(payload: bytes) -> int:
-    """
-    Parse RTCM3 message type from payload.
-
-    RTCM3 framing:
-      - 0xD3 sync
-      - 6 bits reserved + 10 bits length
-      - payload (length bytes)
-      - 3-byte CRC
-
-    The first 12 bits of the payload are the message number.
-    """
-    if len(payload) < 2:
-        return -1
-
-    # First two payload bytes contain the 12‑bit message number (big‑endian)
-    # Bits: [msg_type(12)] [rest...]
-    msg_type = ((payload[0] << 4) | (payload[1] >> 4)) & 0x0FFF
-    return msg_type
+def _drain_logs(log_q: "queue.Queue[Optional[str]]") -> None:
+    """Print queued messages until a None sentinel arrives."""
+    while True:
+        msg = log_q.get()
+        if msg is None:
+            return
+        print(msg)
 
 
 def read_rtcm_stream(sock: socket.socket, initial_data: bytes = b"") -> Dict[str, object]:
@@ -78,10 +130,19 @@ def read_rtcm_stream(sock: socket.socket, initial_data: bytes = b"") -> Dict[str
         sock: The socket to read from
         initial_data: Optional binary data that was already received (e.g., from header)
     """
-    buffer = bytearray(initial_data)
+    # Fixed receive buffer: bytes before `offset` are parsed, bytes up to
+    # `write_pos` are valid. Room is kept for one read plus a partial frame.
+    buffer = bytearray(len(initial_data) + RECV_CHUNK + RTCM_MAX_FRAME)
+    buffer[: len(initial_data)] = initial_data
+    view = memoryview(buffer)
+    offset = 0
+    write_pos = len(initial_data)
     total_bytes = len(initial_data)  # Count initial data too
-    msg_counts: Counter[int] = Counter()
-    start_time = time.time()
+    # Plain dict seeded with the expected types; others are added on first sight
+    msg_counts: Dict[int, int] = dict.fromkeys(EXPECTED_TYPES, 0)
+    # Monotonic clock: rates stay right if the wall clock is adjusted
+    monotonic = time.monotonic
+    start_time = monotonic()
     last_report = start_time
 
     # If no bytes arrive for this many seconds, we log a warning.
@@ -93,90 +154,132 @@ def read_rtcm_stream(sock: socket.socket, initial_data: bytes = b"") -> Dict[str
         print(f"📦 Processing {len(initial_data)} bytes from header...")
     print("Press Ctrl+C to stop.\n")
 
-    while True:
-        try:
-            chunk = sock.recv(4096)
-        except socket.timeout:
-            print("⚠️  Timeout while waiting for data (no bytes for 30s) – still listening...")
-            continue
-        except OSError as e:
-            print(f"❌ Socket error: {e}")
-            break
-
-        if not chunk:
-            print("⚠️  Connection closed by server.")
-            break
+    # Console output can block for tens of ms on Windows; print from a
+    # helper thread so the receive loop never waits on it
+    log_q: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=64)
+    log_thread = threading.Thread(target=_drain_logs, args=(log_q,), daemon=True)
+    log_thread.start()
 
-        buffer.extend(chunk)
-        total_bytes += len(chunk)
+    def log(msg: str) -> None:
+        try:
+            log_q.put_nowait(msg)
+        except queue.Full:
+            pass  # Drop the message rather than stall the receive loop
+
+    # Hot-loop lookups bound once
+    recv_into = sock.recv_into
+    find = buffer.find
+    unpack = _UNPACK_H
+    crc = crc24q
+    from_bytes = int.from_bytes
+    count_of = msg_counts.get
 
-        # Parse as many RTCM3 frames as possible from the buffer
+    try:
         while True:
-            # Look for sync byte 0xD3
             try:
-                sync_index = buffer.index(0xD3)
-            except ValueError:
-                # No sync byte in buffer yet
-                buffer.clear()
-                break
-
-            if len(buffer) - sync_index < 3:
-                # Not enough data for header yet
-                # Keep partial data
-                if sync_index > 0:
-                    del buffer[:sync_index]
+                n = recv_into(view[write_pos:], RECV_CHUNK)
+            except socket.timeout:
+                log("⚠️  Timeout while waiting for data (no bytes for 30s) – still listening...")
+                continue
+            except OSError as e:
+                log(f"❌ Socket error: {e}")
                 break
 
-            # Header after sync: 2 bytes (6 bits reserved + 10 bits length)
-            header = buffer[sync_index + 1 : sync_index + 3]
-            length = ((header[0] & 0x03) << 8) | header[1]
-
-            frame_len = 3 + length + 3  # sync+header + payload + CRC
-            if len(buffer) - sync_index < frame_len:
-                # Wait for more data
-                if sync_index > 0:
-                    del buffer[:sync_index]
+            if not n:
+                log("⚠️  Connection closed by server.")
                 break
 
-            frame = buffer[sync_index : sync_index + frame_len]
-            # Remove frame from buffer
-            del buffer[: sync_index + frame_len]
-
-            payload = frame[3:-3]
-            msg_type = parse_rtcm3_message_type(payload)
-            if msg_type > 0:
-                msg_counts[msg_type] += 1
-
-        now = time.time()
-        if now - last_report >= 2.0:
-            elapsed = now - start_time
-            bps = total_bytes / elapsed if elapsed > 0 else 0.0
-
-            # Prepare counts for expected types
-            counts_display = []
-            for t in sorted(EXPECTED_TYPES):
-                counts_display.append(f"{t}: {msg_counts.get(t, 0)}")
-            # Also show top 5 most frequent types (could include others)
-            top_types = ", ".join(
-                f"{t}({c})" for t, c in msg_counts.most_common(5)
-            )
+            write_pos += n
+            total_bytes += n
+
+            # Parse as many RTCM3 frames as possible from the buffer
+            while True:
+                # Look for sync byte 0xD3 in the unparsed tail
+                sync_index = find(b"\xD3", offset, write_pos)
+                if sync_index == -1:
+                    # No sync byte in buffer yet
+                    offset = write_pos
+                    break
+
+                # Keep partial data from the sync byte on
+                offset = sync_index
+                if write_pos - sync_index < 3:
+                    # Not enough data for header yet
+                    break
+
+                # Header after sync: 2 bytes (6 bits reserved + 10 bits length).
+                # Reserved bits set, or a payload too short for a message
+                # number, mean this 0xD3 is not a frame start: resync now
+                # instead of waiting for up to 1 KiB that will fail the CRC.
+                header = unpack(buffer, sync_index + 1)[0]
+                length = header & 0x03FF
+                if header & 0xFC00 or length < 2:
+                    offset = sync_index + 1
+                    continue
+
+                frame_len = 3 + length + 3  # sync+header + payload + CRC
+                if write_pos - sync_index < frame_len:
+                    # Wait for more data
+                    break
+
+                # Verify CRC-24Q over sync + header + payload; on a mismatch the
+                # sync byte was payload or noise, so resync from the next byte
+                crc_index = sync_index + 3 + length
+                if crc(view[sync_index:crc_index]) != from_bytes(view[crc_index : crc_index + 3], "big"):
+                    offset = sync_index + 1
+                    continue
+
+                offset = sync_index + frame_len
+
+                # Message number read in place, without copying the frame
+                msg_type = unpack(buffer, sync_index + 3)[0] >> 4
+                if msg_type > 0:
+                    msg_counts[msg_type] = count_of(msg_type, 0) + 1
+
+            if offset == write_pos:
+                # Everything parsed: start over at the front for free
+                offset = write_pos = 0
+            elif len(buffer) - write_pos < RECV_CHUNK:
+                # Move the partial frame to the front to make room for a full read
+                remaining = write_pos - offset
+                view[:remaining] = view[offset:write_pos]
+                offset = 0
+                write_pos = remaining
+
+            now = monotonic()
+            if now - last_report >= 2.0:
+                elapsed = now - start_time
+                bps = total_bytes / elapsed if elapsed > 0 else 0.0
+
+                # Prepare counts for expected types
+                counts_display = " | ".join(f"{t}: {count_of(t, 0)}" for t in _EXPECTED_SORTED)
+                # Also show top 5 most frequent types (could include others)
+                seen = [item for item in msg_counts.items() if item[1]]
+                top_types = ", ".join(
+                    f"{t}({c})" for t, c in heapq.nlargest(5, seen, key=itemgetter(1))
+                )
 
-            print(
-                f"[{elapsed:6.1f}s] "
-                f"bytes={total_bytes}  rate={bps:8.1f} B/s  "
-                f"expected: {' | '.join(counts_display)}"
-            )
-            if top_types:
-                print(f"    top types: {top_types}")
+                report = (
+                    f"[{elapsed:6.1f}s] "
+                    f"bytes={total_bytes}  rate={bps:8.1f} B/s  "
+                    f"expected: {counts_display}"
+                )
+                if top_types:
+                    report += f"\n    top types: {top_types}"
+                log(report)
 
-            last_report = now
+                last_report = now
+    finally:
+        # Flush pending messages before the caller prints anything else
+        log_q.put(None)
+        log_thread.join(1.0)
 
     # Final stats
-    elapsed = time.time() - start_time
+    elapsed = monotonic() - start_time
     return {
         "total_bytes": total_bytes,
         "elapsed": elapsed,
-        "msg_counts": dict(msg_counts),
+        "msg_counts": {t: c for t, c in msg_counts.items() if c},
     }
 
 
@@ -198,6 +301,9 @@ def connect_ntrip(
             print(f"[DEBUG] socket.create_connection error: {e}")
         raise
 
+    # Don't hold the small request back waiting for an ACK (Nagle)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     # Allow a bit more time while reading the HTTP/NTRIP header
     sock.settimeout(30.0)
 
@@ -208,7 +314,8 @@ def connect_ntrip(
 
     # Read HTTP/NTRIP response header (some casters send a big SOURCETABLE or banner)
     # We allow up to 64 KiB before giving up.
-    header = b""
+    header = bytearray()  # Grown in place; returned as bytes
+    has_200 = False  # "ICY 200" or " 200 " seen so far
     max_header = 64 * 1024
     if DEBUG:
         print("[DEBUG] Starting to read response header from server...")
@@ -217,11 +324,7 @@ def connect_ntrip(
             chunk = sock.recv(1024)
         except socket.timeout:
             # If we already see a 200/ICY 200 status line, accept what we have.
-            try:
-                text = header.decode("iso-8859-1", errors="replace")
-            except Exception:
-                text = ""
-            if "ICY 200" in text or " 200 " in text:
+            if has_200:
                 if DEBUG:
                     print(
                         "[DEBUG] Timeout while reading header, but 200 status "
@@ -244,15 +347,20 @@ def connect_ntrip(
                 )
             break
 
-        header += chunk
+        header.extend(chunk)
+        if not has_200:
+            # Only the new bytes (plus overlap for a split status) need checking
+            start = max(0, len(header) - len(chunk) - 6)
+            has_200 = header.find(b"ICY 200", start) != -1 or header.find(b" 200 ", start) != -1
         if DEBUG:
             print(
                 f"[DEBUG] Received header chunk: {len(chunk)} bytes, "
                 f"total header length: {len(header)} bytes"
             )
 
-        # Normal HTTP/NTRIP header termination
-        if b"\r\n\r\n" in header:
+        # Normal HTTP/NTRIP header termination. Earlier bytes were already
+        # searched, so only look at the new chunk plus a 3-byte overlap.
+        if header.find(b"\r\n\r\n", max(0, len(header) - len(chunk) - 3)) != -1:
             if DEBUG:
                 print("[DEBUG] Found '\\r\\n\\r\\n' – end of HTTP header.")
             break
@@ -260,11 +368,7 @@ def connect_ntrip(
         # Some NTRIP casters send "ICY 200 OK" followed directly by data,
         # without an empty line. If we see a 200 status line, accept it
         # as soon as we have received a reasonable amount of data.
-        try:
-            text = header.decode("iso-8859-1", errors="replace")
-        except Exception:
-            text = ""
-        if ("ICY 200" in text or " 200 " in text) and len(header) > 128:
+        if has_200 and len(header) > 128:
             if DEBUG:
                 print(
                     "[DEBUG] Detected '200' status without explicit "
@@ -275,7 +379,7 @@ def connect_ntrip(
     if DEBUG:
         print("[DEBUG] Finished reading header (may include some data bytes).")
 
-    return sock, header
+    return sock, bytes(header)
 
 
 def check_response_header(header: bytes) -> Tuple[bytes, bytes]:
@@ -302,10 +406,9 @@ def check_response_header(header: bytes) -> Tuple[bytes, bytes]:
                 header_end = data_start
             else:
                 # Try to find first non-printable byte
-                for i in range(status_end + 2, min(len(header), status_end + 200)):
-                    if header[i] < 32 and header[i] not in (9, 10, 13):  # Not tab, LF, CR
-                        header_end = i
-                        break
+                match = _CONTROL_BYTE.search(header, status_end + 2, status_end + 200)
+                if match:
+                    header_end = match.start()
     
     if header_end == -1:
         header_end = len(header)
@@ -353,9 +456,6 @@ def write_summary_log(
     error: Optional[str],
 ) -> None:
     """Write one log file per run summarizing results and errors."""
-    # Ensure logs directory exists
-    os.makedirs(LOG_DIR, exist_ok=True)
-    
     ts = datetime.now()
     log_filename = ts.strftime("ntrip_log_%Y%m%d_%H%M%S.txt")
     filename = os.path.join(LOG_DIR, log_filename)
@@ -378,8 +478,7 @@ def write_summary_log(
         lines.append(f"Bytes      : {total_bytes}")
         lines.append(f"Avg rate   : {bps:.1f} B/s")
         lines.append("RTCM types :")
-        for t in sorted(msg_counts.keys()):
-            lines.append(f"  - {t}: {msg_counts[t]}")
+        lines.extend(f"  - {t}: {c}" for t, c in sorted(msg_counts.items()))
     else:
         lines.append("Result     : NO DATA (connection failed before stream)")
 
@@ -390,9 +489,11 @@ def write_summary_log(
     else:
         lines.append("Error      : (none)")
 
+    # One encoded write; os.linesep keeps the line endings text mode produced
+    data = (os.linesep.join(lines) + os.linesep).encode("utf-8")
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
+        with open(filename, "wb") as f:
+            f.write(data)
         print(f"📝 Summary log written to {filename}")
     except OSError as e:
         print(f"⚠️  Failed to write log file: {e}")
@@ -401,6 +502,9 @@ def write_summary_log(
 def main() -> None:
     host = HOST
 
+    # Ensure logs directory exists (once per run, before any summary is written)
+    os.makedirs(LOG_DIR, exist_ok=True)
+
     # Optional IP override from command line
     if len(sys.argv) >= 2:
         host = sys.argv[1]